@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import argparse
+import urllib.error
+import urllib.request
+
+#Thin client for the evaluation service started with "python main.py serve".
+#It only uses the standard library, so it starts instantly and does not need transformers, torch or nltk installed.
+
+#scores.npz needs numpy and pandas, so it is only written when they are installed.
+#"python main.py compare" falls back to results.json otherwise.
+try:
+    from src.comparator import save_scores
+except ImportError:
+    save_scores = None
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Send test cases to a running evaluation service")
+    parser.add_argument("cases", nargs="?", default="data/test_cases.json", help="JSON file with test cases")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Address of the evaluation service")
+    parser.add_argument("--output-dir", default="outputs", help="Where results.json and the report are written")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for the service")
+    args = parser.parse_args()
+
+
+    with open(args.cases, "r") as f:
+        test_cases = json.load(f)
+
+    request = urllib.request.Request(
+        args.url.rstrip("/") + "/evaluate",
+        data=json.dumps({'cases': test_cases}).encode("utf-8"),
+        headers={'Content-Type': 'application/json'},
+        method="POST"
+    )
+
+
+    print(f"Sending {len(test_cases)} test cases to {args.url}...")
+
+    results = []
+    summary = None
+
+    #The service streams one JSON event per line, so progress is printed while the batch is still running.
+    try:
+        with urllib.request.urlopen(request, timeout=args.timeout) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+
+                if event['event'] == 'progress':
+                    print(f"Processed {event['index']+1}/{len(test_cases)}: {event['template']}")
+                elif event['event'] == 'result':
+                    results.append(event['result'])
+                elif event['event'] == 'summary':
+                    summary = event
+                elif event['event'] == 'error':
+                    print(f"Evaluation failed: {event['message']}")
+                    sys.exit(1)
+    except urllib.error.HTTPError as e:
+        print(f"Service rejected the request: {e.read().decode('utf-8', 'replace')}")
+        sys.exit(1)
+    except urllib.error.URLError as e:
+        print(f"Could not reach the evaluation service at {args.url}: {e.reason}")
+        sys.exit(1)
+
+    if summary is None:
+        print("Connection closed before the evaluation finished")
+        sys.exit(1)
+
+
+    #Writes the same files as a local run of main.py.
+    analysis = summary['analysis']
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    results_path = os.path.join(args.output_dir, "results.json")
+    with open(results_path, "w") as f:
+        json.dump({
+            'results': results,
+            'analysis': analysis,
+            'relevance_vectorizer': summary.get('relevance_vectorizer')
+        }, f, indent=2)
+
+    report_path = os.path.join(args.output_dir, "evaluation_report.md")
+    with open(report_path, "w") as f:
+        f.write(summary['report'])
+
+    scores_path = os.path.join(args.output_dir, "scores.npz")
+    if save_scores:
+        save_scores(results, scores_path, summary.get('relevance_vectorizer'))
+    elif os.path.exists(scores_path):
+        #A scores.npz from an earlier run would otherwise be compared instead of these results.
+        os.remove(scores_path)
+
+
+    print("\nEvaluation Complete")
+    print(f"Average Score: {analysis['summary']['avg_overall_score']:.3f}")
+    print(f"Best Prompt: {analysis['best_prompts'][0]['template']} ({analysis['best_prompts'][0]['overall']:.3f})")
+    print(f"Worst Prompt: {analysis['worst_prompts'][0]['template']} ({analysis['worst_prompts'][0]['overall']:.3f})")
+    print(f"\nResults saved to {results_path}")
+    if save_scores:
+        print(f"Scores saved to {scores_path}")
+    print(f"Report saved to {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,149 @@
 import os
+import sys
 import json
-from src.prompt_catalog import PromptCatalog
-from src.evaluator import Evaluator
-from src.model_interface import ModelInterface
-from src.analyzer import Analyzer
+import argparse
+from src.comparator import RunComparator, save_scores
 
 def main():
 
+    #Options shared by the commands that load the model and evaluator, so each one is defined once.
+    pipeline_options = argparse.ArgumentParser(add_help=False)
+    pipeline_options.add_argument("--vectorizer", help="Load a saved relevance vectorizer instead of fitting one per run or job")
+    pipeline_options.add_argument("--model", default="gpt2", help="Hugging Face model used with --no-mock")
+    pipeline_options.add_argument("--no-mock", action="store_true",
+                                  help="Load and use the real model instead of mock responses")
+    
+    parser = argparse.ArgumentParser(description="Prompt Evaluation Pipeline")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    #run is the default command, so "python main.py" works as before.
+    run_parser = subparsers.add_parser("run", parents=[pipeline_options], help="Evaluate data/test_cases.json (default)")
+    run_parser.add_argument("--save-vectorizer", help="Save the relevance vectorizer fitted on this run to this path")
+    
+    #serve keeps the model and evaluator loaded and accepts jobs over HTTP (see client.py).
+    serve_parser = subparsers.add_parser("serve", parents=[pipeline_options], help="Run a long-lived evaluation service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--max-batch-size", type=int, default=256,
+                              help="Maximum number of test cases evaluated together")
+    serve_parser.add_argument("--batch-window", type=float, default=0.05,
+                              help="Seconds to wait for more jobs before running a batch")
+    
+    #compare joins two saved runs on their case hashes and reports which cases and templates got worse.
+    compare_parser = subparsers.add_parser("compare", help="Compare the scores of two runs")
+    compare_parser.add_argument("base", help="Earlier run: scores.npz, its directory, or results.json")
+    compare_parser.add_argument("current", help="Later run: scores.npz, its directory, or results.json")
+    compare_parser.add_argument("--threshold", type=float, default=0.05,
+                                help="Smallest drop in overall score that counts as a regression")
+    compare_parser.add_argument("--top", type=int, default=20, help="Number of regressed cases shown in the report")
+    compare_parser.add_argument("--output", help="Also write the full comparison, with per-metric deltas for every changed case, to this JSON file")
+    compare_parser.add_argument("--fail-on-regression", action="store_true",
+                                help="Exit with status 1 if any case or template regressed (errors exit with 2)")
+    
+    #Arguments that don't start with a command go to run, e.g. "python main.py --vectorizer v.joblib".
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in subparsers.choices and argv[0] not in ("-h", "--help"):
+        argv = ["run"] + argv
+    args = parser.parse_args(argv)
+    
+    if args.command == "serve":
+        serve(args)
+    elif args.command == "compare":
+        compare(args)
+    else:
+        run(args)
+
+
+#The model, evaluator and service are imported only when needed, so compare does not pay for loading transformers.
+def serve(args):
+    from src.pipeline import Pipeline
+    from src.service import EvaluationService
+
+    print("Starting Prompt Evaluation Service")
+    
+    pipeline = Pipeline(model_name=args.model, use_mock=not args.no_mock, relevance_model=args.vectorizer)
+    service = EvaluationService(pipeline, max_batch_size=args.max_batch_size, batch_window=args.batch_window)
+    service.serve(args.host, args.port)
+
+
+def compare(args):
+
+    comparator = RunComparator(threshold=args.threshold)
+    try:
+        comparison = comparator.compare(comparator.load(args.base), comparator.load(args.current),
+                                        include_cases=bool(args.output))
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Could not compare runs: {e}")
+        sys.exit(2)
+    
+    print(comparator.generate_report(comparison, top=args.top))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(comparison, f, indent=2)
+        print(f"\nComparison saved to {args.output}")
+    
+    summary = comparison['summary']
+    if args.fail_on_regression and (summary['regressed_cases'] or summary['regressed_templates']):
+        sys.exit(1)
+
+
+def run(args):
+    from src.pipeline import Pipeline
+    from src.analyzer import Analyzer
+
     print("Starting Prompt Evaluation Pipeline")
     
     os.makedirs("outputs", exist_ok=True)
     
     
-    catalog = PromptCatalog()
-    evaluator = Evaluator()
-    model = ModelInterface(use_mock=True)
+    pipeline = Pipeline(model_name=args.model, use_mock=not args.no_mock, relevance_model=args.vectorizer)
     analyzer = Analyzer()
     
    
     with open("data/test_cases.json", "r") as f:
         test_cases = json.load(f)
     
-    results = []
-    
     
     print(f"Processing {len(test_cases)} test cases...")
     
-    for i, case in enumerate(test_cases):
-        template_name = case["template"]
-        params = case["params"]
-        
-        
-        prompt = catalog.get_prompt(template_name, **params)
-        response = model.generate(prompt)
-        
-        
-        evaluation = evaluator.evaluate(prompt, response)
-        
-        result = {
-            'id': i,
-            'template': template_name,
-            'prompt': prompt,
-            'response': response,
-            'scores': evaluation
-        }
-        
-        results.append(result)
-        print(f"Processed {i+1}/{len(test_cases)}: {template_name}")
+    prompts, responses = pipeline.generate(
+        test_cases,
+        on_progress=lambda i, case: print(f"Processed {i+1}/{len(test_cases)}: {case['template']}")
+    )
+    
+    
+    evaluations = pipeline.evaluate(test_cases, prompts, responses)
+    
+    
+    #Saves the vectorizer this run was scored with so later runs can reuse it.
+    evaluator = pipeline.evaluator
+    if args.save_vectorizer:
+        try:
+            (evaluator.relevance or evaluator.fitted_relevance).save(args.save_vectorizer)
+        except ValueError as e:
+            print(f"Could not save relevance vectorizer: {e}")
+    
+    results = pipeline.collect(test_cases, prompts, responses, evaluations)
     
     
     analysis = analyzer.analyze(results)
     
     
+    #relevance_vectorizer records which vectorizer scored relevance, so compare can tell if two runs are comparable.
+    vectorizer = pipeline.relevance_fingerprint()
     output_data = {
         'results': results,
-        'analysis': analysis
+        'analysis': analysis,
+        'relevance_vectorizer': vectorizer
     }
     
     with open("outputs/results.json", "w") as f:
         json.dump(output_data, f, indent=2)
     
+    #Score columns are also saved on their own so "python main.py compare" can read them quickly.
+    save_scores(results, "outputs/scores.npz", vectorizer)
+    
     
     report = analyzer.generate_report(analysis)
     with open("outputs/evaluation_report.md", "w") as f:
@@ -71,6 +155,7 @@ def main():
     print(f"Best Prompt: {analysis['best_prompts'][0]['template']} ({analysis['best_prompts'][0]['overall']:.3f})")
     print(f"Worst Prompt: {analysis['worst_prompts'][0]['template']} ({analysis['worst_prompts'][0]['overall']:.3f})")
     print("\nResults saved to outputs/results.json")
+    print("Scores saved to outputs/scores.npz")
     print("Report saved to outputs/evaluation_report.md")
 
 if __name__ == "__main__":
@@ -28,7 +28,8 @@ class Analyzer:
                 'correctness': float(df['correctness'].mean()),
                 'bias_check': float(df['bias_check'].mean()),
                 'clarity': float(df['clarity'].mean()),
-                'age_appropriate': float(df['age_appropriate'].mean())
+                'age_appropriate': float(df['age_appropriate'].mean()),
+                'relevance': float(df['relevance'].mean())
             }
         }
         
@@ -77,6 +78,16 @@ class Analyzer:
                 'description': 'Prompts not well-suited for target age group'
             })
         
+        
+        relevance_problems = df[df['relevance'] < 0.1]
+        if len(relevance_problems) > 0:
+            failure_modes.append({
+                'type': 'off_topic',
+                'count': int(len(relevance_problems)),
+                'templates': relevance_problems['template'].tolist(),
+                'description': 'Responses that barely mention the concept the prompt asks about'
+            })
+        
 #It will call the helper method (generate_mitigations()) to propose strategies based on what went wrong.     
         mitigations = self._generate_mitigations(failure_modes, summary)
         
@@ -121,6 +132,12 @@ class Analyzer:
                 "complexity based on developmental appropriateness"
             )
         
+        if 'off_topic' in failure_types:
+            mitigations.append(
+                "Keep responses on topic: Restate the key concept from the prompt in the "
+                "answer and avoid generic fallback explanations"
+            )
+        
 #It will check low metric averages        
         if summary['metric_averages']['clarity'] < 0.7:
             mitigations.append(
@@ -166,6 +183,7 @@ class Analyzer:
 - **Bias Check**: {analysis['summary']['metric_averages']['bias_check']:.3f}
 - **Clarity**: {analysis['summary']['metric_averages']['clarity']:.3f}
 - **Age Appropriate**: {analysis['summary']['metric_averages']['age_appropriate']:.3f}
+- **Relevance**: {analysis['summary']['metric_averages']['relevance']:.3f}
 
 ## Top 3 Performing Prompts
 """
@@ -230,6 +248,9 @@ class Analyzer:
         
         if metrics['age_appropriate'] < 0.7:
             report += "\n- **Target**: Better age-appropriate language and concepts"
+        
+        if metrics['relevance'] < 0.3:
+            report += "\n- **Focus Area**: Keep responses focused on the concept asked about"
 
 
 # Footer of the Report
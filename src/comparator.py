@@ -0,0 +1,208 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy import stats
+from typing import Any, Dict, List, Optional
+#case_hash lives next to PromptCatalog so the pipeline does not import pandas; it is re-exported here for callers that compare runs.
+from src.prompt_catalog import case_hash
+
+
+#It saves only the case hashes, templates and score columns of a run, so runs can be compared without reading prompts and responses.
+#vectorizer is the fingerprint of the relevance vectorizer the run was scored with (see RelevanceScorer.fingerprint).
+def save_scores(results: List[Dict], path: str, vectorizer: Optional[str] = None) -> None:
+    templates, template_codes = np.unique([r['template'] for r in results], return_inverse=True)
+
+    columns = {
+        'case_hash': np.array([int(r['case_hash'], 16) for r in results], dtype=np.uint64),
+        'template_codes': template_codes.astype(np.int32),
+        'templates': templates,
+        'vectorizer': np.array(vectorizer or '')
+    }
+    for metric in results[0]['scores'] if results else []:
+        columns[f'score_{metric}'] = np.array([r['scores'][metric] for r in results], dtype=np.float32)
+
+    np.savez(path, **columns)
+
+
+#It compares two runs case by case and per template, and flags the ones that got worse.
+class RunComparator:
+    def __init__(self, threshold: float = 0.05):
+        #Smallest drop in the overall score that counts as a regression.
+        self.threshold = threshold
+
+#Loads a run from a scores.npz file, a results.json file (slower, reads everything) or a directory with either of them.
+#A scores.npz older than the results.json next to it is left over from an earlier run and is skipped.
+#Returns one row per case hash with the template and one column per metric.
+    def load(self, path: str) -> pd.DataFrame:
+        if os.path.isdir(path):
+            path = os.path.join(path, "scores.npz")
+            if not os.path.exists(path):
+                path = os.path.join(os.path.dirname(path), "results.json")
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{os.path.dirname(path)} has neither scores.npz nor results.json")
+
+        if path.endswith(".npz"):
+            results_path = os.path.join(os.path.dirname(path), "results.json")
+            if os.path.exists(results_path) and os.path.getmtime(path) < os.path.getmtime(results_path):
+                print(f"Warning: {path} is older than {results_path}, reading the scores from {results_path}")
+                path = results_path
+
+        if path.endswith(".json"):
+            with open(path, "r") as f:
+                run = json.load(f)
+            results = run['results']
+            vectorizer = run.get('relevance_vectorizer')
+            if results and 'case_hash' not in results[0]:
+                raise ValueError(f"{path} has no case hashes; re-run the evaluation to compare it")
+            df = pd.DataFrame({
+                'template': [r['template'] for r in results],
+                **{metric: np.array([r['scores'][metric] for r in results], dtype=np.float32) for metric in (results[0]['scores'] if results else [])}
+            }, index=pd.Index([int(r['case_hash'], 16) for r in results], dtype=np.uint64))
+        elif path.endswith(".npz"):
+            with np.load(path) as data:
+                metrics = {key[len('score_'):]: data[key] for key in data.files if key.startswith('score_')}
+                vectorizer = str(data['vectorizer']) if 'vectorizer' in data.files else None
+                df = pd.DataFrame({
+                    'template': pd.Categorical.from_codes(data['template_codes'], categories=data['templates']),
+                    **metrics
+                }, index=pd.Index(data['case_hash']))
+        else:
+            raise ValueError(f"{path} is not a scores.npz, a results.json or a run directory")
+
+#The same case can appear more than once in a run. Duplicates are averaged into one row, and the number of
+#extra rows is kept in attrs so compare() can report it instead of hiding it.
+        duplicate_cases = len(df) - df.index.nunique()
+        if duplicate_cases:
+            scores = df.drop(columns='template').groupby(level=0).mean()
+            templates = df['template'].groupby(level=0).first()
+            df = scores.assign(template=templates)
+        df.attrs['duplicate_cases'] = duplicate_cases
+        #Runs from before vectorizers were recorded, or with nothing learned, have no fingerprint.
+        df.attrs['vectorizer'] = vectorizer or None
+
+        return df
+
+#Joins the two runs on the case hash index and computes the score change of every metric for every case.
+#With include_cases the result also lists every matched case whose scores changed, with its delta for every metric.
+    def compare(self, base: pd.DataFrame, current: pd.DataFrame, include_cases: bool = False) -> Dict[str, Any]:
+        metrics = [m for m in base.columns if m != 'template' and m in current.columns]
+        if 'overall' not in metrics:
+            raise ValueError("Both runs need an 'overall' score to be compared")
+
+        joined = base[metrics].join(current[metrics + ['template']], how='inner', lsuffix='_base', rsuffix='_current')
+        deltas = pd.DataFrame(
+            joined[[f'{m}_current' for m in metrics]].to_numpy() - joined[[f'{m}_base' for m in metrics]].to_numpy(),
+            columns=metrics, index=joined.index
+        )
+        deltas['template'] = joined['template'].to_numpy()
+
+#A case regressed when its overall score dropped by at least the threshold.
+#Masks and columns are passed as plain arrays so pandas does not realign them on the uint64 hash index.
+        overall_delta = deltas['overall'].to_numpy()
+        mask = overall_delta <= -self.threshold
+        regressed = joined[mask].assign(delta=overall_delta[mask]).sort_values('delta')
+        regressed_cases = pd.DataFrame({
+            'case_hash': [format(h, '016x') for h in regressed.index.tolist()],
+            'template': regressed['template'].astype(str).to_numpy(),
+            'base': regressed['overall_base'].to_numpy(dtype=np.float64),
+            'current': regressed['overall_current'].to_numpy(dtype=np.float64),
+            'delta': regressed['delta'].to_numpy(dtype=np.float64)
+        }).to_dict('records')
+
+#A case changed when any of its metrics moved at all; with include_cases each one is listed with every metric's delta.
+        delta_values = deltas[metrics].to_numpy()
+        changed = (delta_values != 0).any(axis=1)
+
+        if include_cases:
+            comparison_cases = pd.DataFrame({
+                'case_hash': [format(h, '016x') for h in joined.index[changed].tolist()],
+                'template': deltas['template'].astype(str).to_numpy()[changed],
+                **{m: delta_values[changed, i].astype(np.float64) for i, m in enumerate(metrics)}
+            }).to_dict('records')
+
+#A template regressed when its mean drop reaches the threshold and, with more than one case, a one-sample t-test
+#also puts it below zero at the 95% level. Templates often have only a handful of cases, so the cutoff comes from the
+#t distribution with count - 1 degrees of freedom rather than the normal 1.96. With a single case there is no spread,
+#the cutoff is NaN and the threshold alone decides.
+        by_template = deltas.groupby('template', observed=True)['overall'].agg(['count', 'mean', 'std'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_stat = by_template['mean'] / (by_template['std'] / np.sqrt(by_template['count']))
+            critical = stats.t.ppf(0.975, by_template['count'] - 1)
+        by_template['significant'] = (by_template['mean'] <= -self.threshold) & ~(t_stat > -critical)
+
+        templates = [{
+            'template': str(name),
+            'count': int(row['count']),
+            'mean_delta': float(row['mean']),
+            'regressed': bool(row['significant'])
+        } for name, row in by_template.sort_values('mean').iterrows()]
+
+        comparison = {
+            'summary': {
+                'matched_cases': int(len(joined)),
+                'changed_cases': int(changed.sum()),
+                'only_in_base': int(len(base.index.difference(joined.index))),
+                'only_in_current': int(len(current.index.difference(joined.index))),
+                'duplicates_in_base': int(base.attrs.get('duplicate_cases', 0)),
+                'duplicates_in_current': int(current.attrs.get('duplicate_cases', 0)),
+                'regressed_cases': len(regressed_cases),
+                'regressed_templates': sum(1 for t in templates if t['regressed']),
+                'threshold': self.threshold,
+                'same_vectorizer': self._same_vectorizer(base, current)
+            },
+            'metric_deltas': {m: float(deltas[m].mean()) if len(deltas) else 0.0 for m in metrics},
+            'templates': templates,
+            'regressions': regressed_cases
+        }
+        if include_cases:
+            comparison['cases'] = comparison_cases
+        return comparison
+
+#Relevance, and so the overall score, depends on the IDF weights of the vectorizer a run was scored with.
+#Runs that each fitted their own vectorizer can differ even when no response changed, so they only compare
+#cleanly when both were scored with the same saved vectorizer.
+    def _same_vectorizer(self, base: pd.DataFrame, current: pd.DataFrame) -> bool:
+        vectorizer = base.attrs.get('vectorizer')
+        return vectorizer is not None and vectorizer == current.attrs.get('vectorizer')
+
+#It turns the comparison into a Markdown report, listing at most `top` regressed cases.
+    def generate_report(self, comparison: Dict[str, Any], top: int = 20) -> str:
+        summary = comparison['summary']
+
+        report = f"""# Run Comparison Report
+
+## Summary
+
+- **Matched cases**: {summary['matched_cases']}
+- **Changed cases**: {summary['changed_cases']}
+- **Only in base run**: {summary['only_in_base']}
+- **Only in current run**: {summary['only_in_current']}
+- **Regressed cases** (overall drop >= {summary['threshold']:.3f}): {summary['regressed_cases']}
+- **Regressed templates**: {summary['regressed_templates']}
+"""
+        if summary['duplicates_in_base'] or summary['duplicates_in_current']:
+            report += (f"- **Duplicate cases averaged**: {summary['duplicates_in_base']} in base run, "
+                       f"{summary['duplicates_in_current']} in current run\n")
+
+        if not summary['same_vectorizer']:
+            report += ("\n**Warning**: the runs were not scored with the same relevance vectorizer, so relevance and "
+                       "overall deltas may come from different IDF weights rather than changed responses. Score both "
+                       "runs with the same `--vectorizer` to compare them cleanly.\n")
+
+        report += "\n## Mean Metric Deltas\n"
+        for metric, delta in comparison['metric_deltas'].items():
+            report += f"\n- **{metric}**: {delta:+.3f}"
+
+        report += "\n\n## Per Template\n"
+        for template in comparison['templates']:
+            flag = " **REGRESSED**" if template['regressed'] else ""
+            report += f"\n- **{template['template']}** ({template['count']} cases): {template['mean_delta']:+.3f}{flag}"
+
+        if comparison['regressions']:
+            report += "\n\n## Worst Regressed Cases\n"
+            for case in comparison['regressions'][:top]:
+                report += (f"\n- `{case['case_hash']}` {case['template']}: "
+                           f"{case['base']:.3f} -> {case['current']:.3f} ({case['delta']:+.3f})")
+
+        return report
@@ -1,14 +1,16 @@
 import re
 import numpy as np
-from typing import Dict
+from typing import Dict, List, Optional
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
+from src.relevance import RelevanceScorer
+from src.prompt_catalog import PromptCatalog
 
 
 
 #It checks if the tool needed for understanding text emotions is ready and if not, it downloads it by itself.
 class Evaluator:
-    def __init__(self):
+    def __init__(self, relevance_model: Optional[str] = None):
         try:
             #vader_lexicon is a pre-built list of words and their sentiment scores.
             nltk.data.find('vader_lexicon')
@@ -19,8 +21,55 @@ class Evaluator:
         #Sets up the sentiment analyzer and saves it so it can be used later in the class.
         self.sia = SentimentIntensityAnalyzer()
 
-    #It takes a prompt and its response, evaluates them, and returns a dictionary with scores for different metrics.    
-    def evaluate(self, prompt: str, response: str) -> Dict[str, float]:
+        #Loads a saved relevance vectorizer if one is given, otherwise a new one is fitted on each batch.
+        self.relevance = RelevanceScorer.load(relevance_model) if relevance_model else None
+        #Single pairs are scored without fitting when no saved vectorizer is loaded.
+        self.pair_relevance = RelevanceScorer.unfitted()
+        #The scorer fitted on the last batch, kept so a run can save it for later runs.
+        self.fitted_relevance: Optional[RelevanceScorer] = None
+
+        #Used to find the concept of a prompt when the caller doesn't pass one.
+        self.catalog = PromptCatalog()
+
+    #It takes a prompt and its response, evaluates them, and returns a dictionary with scores for different metrics.
+    #concept is what the response should be about; when it is not given it is recovered from the prompt's template.
+    #Without a saved vectorizer a single pair has no run to learn IDF weights from, so every word counts equally and
+    #its relevance can differ from the score the same pair gets inside evaluate_batch.
+    def evaluate(self, prompt: str, response: str, concept: Optional[str] = None) -> Dict[str, float]:
+        scorer = self.relevance or self.pair_relevance
+        relevance_scores = scorer.score(self._concepts([prompt], [concept]), [response])
+        return self._evaluate([response], relevance_scores)[0]
+
+    #It evaluates all prompts and responses of a run together so relevance can be scored in one batch.
+    def evaluate_batch(self, prompts: List[str], responses: List[str],
+                       concepts: Optional[List[Optional[str]]] = None) -> List[Dict[str, float]]:
+
+        if not prompts:
+            return []
+
+        concepts = self._concepts(prompts, concepts)
+
+#Uses the loaded vectorizer if there is one, otherwise fits a new one on every concept and response of this batch.
+        if self.relevance:
+            relevance_scores = self.relevance.score(concepts, responses)
+        else:
+            self.fitted_relevance = RelevanceScorer()
+            relevance_scores = self.fitted_relevance.fit_score(concepts, responses)
+
+        return self._evaluate(responses, relevance_scores)
+
+    def _evaluate(self, responses: List[str], relevance_scores: np.ndarray) -> List[Dict[str, float]]:
+        return [
+            self._score_response(response, float(relevance))
+            for response, relevance in zip(responses, relevance_scores)
+        ]
+
+    #Cases without a concept get the one recovered from their prompt's template, or the whole prompt if no template matches.
+    def _concepts(self, prompts: List[str], concepts: Optional[List[Optional[str]]]) -> List[str]:
+        concepts = concepts or [None] * len(prompts)
+        return [concept or self.catalog.get_concept_for_prompt(prompt) for concept, prompt in zip(concepts, prompts)]
+
+    def _score_response(self, response: str, relevance: float) -> Dict[str, float]:
         
 #It calls internal methods to calculate scores for fluency, correctness, bias, clarity, and age-appropriateness of the response.        
         scores = {
@@ -28,16 +77,18 @@ class Evaluator:
             'correctness': self._correctness_score(response),
             'bias_check': self._bias_score(response),
             'clarity': self._clarity_score(response),
-            'age_appropriate': self._age_appropriate_score(response)
+            'age_appropriate': self._age_appropriate_score(response),
+            'relevance': relevance
         }
         
 #Sets weights for each score to calculate the final overall score.
         weights = {
-            'fluency': 0.2,
-            'correctness': 0.3,
-            'bias_check': 0.2,
-            'clarity': 0.15,
-            'age_appropriate': 0.15
+            'fluency': 0.15,
+            'correctness': 0.2,
+            'bias_check': 0.15,
+            'clarity': 0.1,
+            'age_appropriate': 0.15,
+            'relevance': 0.25
         }
 
 #Calculates the overall score by combining weighted individual scores, then returns all the scores together.        
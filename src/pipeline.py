@@ -0,0 +1,65 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from src.prompt_catalog import PromptCatalog, case_hash
+from src.evaluator import Evaluator
+from src.model_interface import ModelInterface
+
+
+#It holds the catalog, model and evaluator together so they are loaded once and can be reused for many runs.
+class Pipeline:
+    def __init__(self, model_name: str = "gpt2", use_mock: bool = True, relevance_model: Optional[str] = None):
+        self.catalog = PromptCatalog()
+        self.evaluator = Evaluator(relevance_model=relevance_model)
+        self.model = ModelInterface(model_name=model_name, use_mock=use_mock)
+
+#It builds the prompt for every test case, asks the model for a response and calls on_progress after each case.
+    def generate(self, cases: List[Dict],
+                 on_progress: Optional[Callable[[int, Dict], None]] = None) -> Tuple[List[str], List[str]]:
+        prompts = []
+        responses = []
+
+        for i, case in enumerate(cases):
+            prompt = self.catalog.get_prompt(case["template"], **case["params"])
+            response = self.model.generate(prompt)
+
+            prompts.append(prompt)
+            responses.append(response)
+            if on_progress:
+                on_progress(i, case)
+
+        return prompts, responses
+
+#It puts each case, prompt, response and its scores together into the result format saved in results.json.
+    @staticmethod
+    def collect(cases: List[Dict], prompts: List[str], responses: List[str],
+                evaluations: List[Dict[str, float]]) -> List[Dict]:
+        results = []
+        for i, (case, prompt, response, evaluation) in enumerate(zip(cases, prompts, responses, evaluations)):
+            results.append({
+                'id': i,
+                'case_hash': case_hash(case["template"], case["params"]),
+                'template': case["template"],
+                'prompt': prompt,
+                'response': response,
+                'scores': evaluation
+            })
+        return results
+
+#It returns what each case's response should be about (see PromptCatalog.get_concept).
+    def concepts(self, cases: List[Dict]) -> List[str]:
+        return [self.catalog.get_concept(case["template"], **case["params"]) for case in cases]
+
+#It scores the responses of the given cases in one batch, checking relevance against each case's concept.
+    def evaluate(self, cases: List[Dict], prompts: List[str], responses: List[str]) -> List[Dict[str, float]]:
+        return self.evaluator.evaluate_batch(prompts, responses, self.concepts(cases))
+
+#It identifies the relevance vectorizer the last evaluate call scored with (see RelevanceScorer.fingerprint).
+    def relevance_fingerprint(self) -> Optional[str]:
+        scorer = self.evaluator.relevance or self.evaluator.fitted_relevance
+        return scorer.fingerprint() if scorer else None
+
+#Generates, evaluates all responses in one batch and returns the results.
+    def run(self, cases: List[Dict],
+            on_progress: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        prompts, responses = self.generate(cases, on_progress)
+        evaluations = self.evaluate(cases, prompts, responses)
+        return self.collect(cases, prompts, responses, evaluations)
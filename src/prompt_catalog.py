@@ -1,5 +1,16 @@
+import re
+import json
+import hashlib
 from typing import Dict
 
+
+#It gives every test case a stable ID from its template and params, so the same case can be found again in another run.
+#Unlike the 'id' field it does not change when cases are added, removed or reordered in test_cases.json.
+def case_hash(template: str, params: Dict) -> str:
+    key = json.dumps([template, params], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
 class PromptCatalog:
     def __init__(self):
         self.templates = {
@@ -36,6 +47,12 @@ class PromptCatalog:
             
             "real_world": "Show how {concept} applies in real life for {grade} students."
         }
+        
+        #Params that name what a prompt is about. Relevance checks the response against these instead of the whole prompt.
+        self.concept_params = [
+            'concept', 'concept1', 'concept2', 'topic', 'word', 'subject',
+            'question', 'problem', 'misconception', 'passage', 'story'
+        ]
     
     def get_prompt(self, template_name: str, **kwargs) -> str:
     #Generate a prompt using the specified template and parameters
@@ -44,6 +61,23 @@ class PromptCatalog:
         
         return self.templates[template_name].format(**kwargs)
     
+    def get_concept(self, template_name: str, **kwargs) -> str:
+        #Return the text a response should be about: the concept params, or the template's own wording if it has none
+        if template_name not in self.templates:
+            raise ValueError(f"Template '{template_name}' not found")
+        
+        concept = ' '.join(str(kwargs[p]) for p in self.concept_params if p in kwargs)
+        return concept or re.sub(r'\{\w+\}', '', self.templates[template_name])
+    
+    def get_concept_for_prompt(self, prompt: str) -> str:
+        #Find the template a finished prompt was built from and return its concept, or the prompt itself if none matches
+        for template_name, template in self.templates.items():
+            pattern = re.sub(r'\\\{(\w+)\\\}', r'(?P<\1>.+)', re.escape(template))
+            match = re.fullmatch(pattern, prompt, re.DOTALL)
+            if match:
+                return self.get_concept(template_name, **match.groupdict())
+        return prompt
+    
     def get_all_templates(self) -> Dict[str, str]:
         #Return all available templates
         return self.templates.copy()
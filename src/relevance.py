@@ -0,0 +1,113 @@
+import re
+import hashlib
+import joblib
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Sequence
+from nltk.stem import PorterStemmer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfVectorizer
+
+
+#Stemming is cached per word because the same few thousand words repeat across a large run.
+#The cache is bounded so a long-running process that sees ever new words does not grow without limit.
+_stem = lru_cache(maxsize=2**16)(PorterStemmer().stem)
+
+
+#Splits text into lowercase words, drops English stop words and stems the rest, so "magnetism" and "magnet" count as the same word.
+#It is a module-level function so a saved vectorizer that uses it can be loaded again.
+def stem_tokens(text: str) -> List[str]:
+    words = re.findall(r'\b\w\w+\b', text.lower())
+    return [_stem(w) for w in words if w not in ENGLISH_STOP_WORDS]
+
+
+#Cosine similarity at or above this counts as fully relevant (see RelevanceScorer.score).
+FULL_RELEVANCE = 0.5
+
+
+#It checks whether a response actually talks about the concept it was asked about, using TF-IDF vectors and cosine similarity.
+#The vectorizer is fitted once per run (or loaded from disk) and every concept/response pair is scored together in one batch.
+#It only sees shared words, so an on-topic answer that never names its concept (e.g. describing plants making food
+#from sunlight without saying "photosynthesis") scores 0.
+class RelevanceScorer:
+    def __init__(self, vectorizer: TfidfVectorizer = None):
+
+#Stop words are dropped in stem_tokens so shared filler words ("the", "to", "a") don't count as being on topic.
+#float32 halves the memory of the sparse matrices, which matters when scoring around 1M pairs.
+        self.vectorizer = vectorizer or TfidfVectorizer(
+            tokenizer=stem_tokens,
+            token_pattern=None,
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+
+#A scorer that needs no fitting, for scoring a single pair where IDF weights learned from two texts would mean nothing.
+#All words then count equally, so its scores differ from those of a vectorizer fitted on a whole run.
+    @classmethod
+    def unfitted(cls) -> 'RelevanceScorer':
+        return cls(HashingVectorizer(
+            tokenizer=stem_tokens,
+            token_pattern=None,
+            alternate_sign=False,
+            dtype=np.float32
+        ))
+
+#Fits the vocabulary and IDF weights on every concept and response of the run and scores them in the same pass.
+#fit_transform vectorizes each text once; the first len(concepts) rows are the concepts and the rest the responses.
+    def fit_score(self, concepts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        self._check_lengths(concepts, responses)
+
+        try:
+            vectors = self.vectorizer.fit_transform(list(concepts) + list(responses))
+        except ValueError:
+            #No text had a single word left after dropping stop words, so nothing can be relevant.
+            self.vectorizer = None
+            return np.zeros(len(concepts), dtype=np.float32)
+
+        return self._similarity(vectors[:len(concepts)], vectors[len(concepts):])
+
+#Transforms concepts and responses with the already fitted vectorizer and returns one relevance score per pair.
+    def score(self, concepts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        self._check_lengths(concepts, responses)
+
+        if self.vectorizer is None or not len(concepts):
+            return np.zeros(len(concepts), dtype=np.float32)
+
+        return self._similarity(self.vectorizer.transform(concepts), self.vectorizer.transform(responses))
+
+    def _check_lengths(self, concepts: Sequence[str], responses: Sequence[str]) -> None:
+        if len(concepts) != len(responses):
+            raise ValueError("concepts and responses must have the same length")
+
+    def _similarity(self, concept_vectors, response_vectors) -> np.ndarray:
+
+#TF-IDF rows are already L2 normalized, so the row-wise dot product is the cosine similarity.
+#The element-wise multiply and row sum stay sparse and run in one vectorized step, with no Python loop per pair.
+        similarity = np.asarray(concept_vectors.multiply(response_vectors).sum(axis=1)).ravel()
+
+#A concept is a few words and a response a whole paragraph, so even a focused answer rarely passes a cosine of 0.5.
+#Scaling by FULL_RELEVANCE maps that onto the 0-1 range of the other metrics, while a long text that
+#mentions the concept only in passing still scores close to 0.
+        similarity = similarity / FULL_RELEVANCE
+
+        return np.clip(similarity, 0.0, 1.0)
+
+#Saves the fitted vectorizer so later runs can reuse the same vocabulary and IDF weights.
+#A short ID of the learned vocabulary and IDF weights. Two runs give the same fingerprint only when they were scored
+#with the same fitted vectorizer, e.g. one saved with --save-vectorizer. None when nothing was learned.
+    def fingerprint(self) -> Optional[str]:
+        if self.vectorizer is None or not hasattr(self.vectorizer, 'idf_'):
+            return None
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update('\n'.join(sorted(self.vectorizer.vocabulary_)).encode('utf-8'))
+        digest.update(self.vectorizer.idf_.tobytes())
+        return digest.hexdigest()
+
+#Raises ValueError when the run had no vocabulary to learn, since there is nothing worth reusing.
+    def save(self, path: str) -> None:
+        if self.vectorizer is None:
+            raise ValueError("the relevance vectorizer learned no vocabulary from this run")
+        joblib.dump(self.vectorizer, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'RelevanceScorer':
+        return cls(joblib.load(path))
@@ -0,0 +1,205 @@
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.pipeline import Pipeline
+from src.analyzer import Analyzer
+
+
+#One evaluation request: the test cases it sent and a queue of events that are streamed back to the client.
+class Job:
+    def __init__(self, cases: List[Dict]):
+        self.cases = cases
+        self.events = queue.Queue()
+
+#Yields events until the worker puts None, which marks the end of the job.
+    def stream(self) -> Iterator[Dict]:
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+            yield event
+
+
+#It keeps the pipeline warm and evaluates jobs in a background thread.
+#Jobs that arrive close together are batched and handled by one worker pass; see _run_batch for how they are scored.
+class EvaluationService:
+    def __init__(self, pipeline: Pipeline, max_batch_size: int = 256, batch_window: float = 0.05):
+        self.pipeline = pipeline
+        self.analyzer = Analyzer()
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.jobs = queue.Queue()
+
+        self.worker = threading.Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    def submit(self, cases: List[Dict]) -> Job:
+        job = Job(cases)
+        self.jobs.put(job)
+        return job
+
+#Waits for a job, then keeps collecting jobs for batch_window seconds or until max_batch_size cases are queued.
+    def _worker(self):
+        while True:
+            jobs = [self.jobs.get()]
+            size = len(jobs[0].cases)
+            deadline = time.monotonic() + self.batch_window
+
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    job = self.jobs.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                size += len(job.cases)
+
+#Any unexpected error fails the batch instead of stopping the worker thread.
+            try:
+                self._run_batch(jobs)
+            except Exception as e:
+                for job in jobs:
+                    self._fail(job, f"Batch failed: {e}")
+
+#With a saved vectorizer every job is scored against the same vocabulary, so the batch is generated job by job
+#and then scored in one evaluate_batch call.
+#Without one, each job is scored on its own with a vectorizer fitted only on its cases, exactly like a local run, so a
+#job's scores never depend on which other jobs shared its batch. Combining them would gain nothing, so each job is
+#scored and streamed back as soon as its own responses are generated instead of waiting for the rest of the batch.
+    def _run_batch(self, jobs: List[Job]):
+        shared = self.pipeline.evaluator.relevance is not None
+        ready = []
+
+        for job in jobs:
+            generated = self._generate(job)
+            if generated is None:
+                continue
+            if shared:
+                ready.append((job, *generated))
+            else:
+                self._finish(job, *generated)
+
+        if not ready:
+            return
+
+        all_cases = [case for job, _, _ in ready for case in job.cases]
+        all_prompts = [prompt for _, prompts, _ in ready for prompt in prompts]
+        all_responses = [response for _, _, responses in ready for response in responses]
+
+        try:
+            evaluations = self.pipeline.evaluate(all_cases, all_prompts, all_responses)
+        except Exception as e:
+            for job, _, _ in ready:
+                self._fail(job, f"Evaluation failed: {e}")
+            return
+
+        offset = 0
+        for job, prompts, responses in ready:
+            self._finish(job, prompts, responses, evaluations[offset:offset + len(prompts)])
+            offset += len(prompts)
+
+#Generates the job's responses, streaming progress, and returns its prompts and responses or None if a case is invalid.
+    def _generate(self, job: Job) -> Optional[Tuple[List[str], List[str]]]:
+        try:
+            return self.pipeline.generate(
+                job.cases,
+                on_progress=lambda i, case: job.events.put(
+                    {'event': 'progress', 'index': i, 'template': case["template"]}
+                )
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            self._fail(job, f"Invalid test case: {e}")
+            return None
+
+#Sends the job its results and summary, scoring it on its own first when no evaluations are given.
+    def _finish(self, job: Job, prompts: List[str], responses: List[str],
+                evaluations: Optional[List[Dict[str, float]]] = None):
+        if evaluations is None:
+            try:
+                evaluations = self.pipeline.evaluate(job.cases, prompts, responses)
+            except Exception as e:
+                self._fail(job, f"Evaluation failed: {e}")
+                return
+
+        results = self.pipeline.collect(job.cases, prompts, responses, evaluations)
+        for result in results:
+            job.events.put({'event': 'result', 'result': result})
+
+        analysis = self.analyzer.analyze(results)
+        job.events.put({
+            'event': 'summary',
+            'relevance_vectorizer': self.pipeline.relevance_fingerprint(),
+            'analysis': analysis,
+            'report': self.analyzer.generate_report(analysis)
+        })
+        job.events.put(None)
+
+    def _fail(self, job: Job, message: str):
+        job.events.put({'event': 'error', 'message': message})
+        job.events.put(None)
+
+#Starts the HTTP server and blocks until it is stopped with Ctrl+C.
+    def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        server.service = self
+
+        print(f"Evaluation service listening on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down evaluation service")
+        finally:
+            server.server_close()
+
+
+#POST /evaluate takes {"cases": [...]} in the same format as data/test_cases.json and streams back one JSON event per line.
+#GET /health reports whether the service is up and how many jobs are waiting.
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {'status': 'ok', 'queued_jobs': self.server.service.jobs.qsize()})
+
+    def do_POST(self):
+        if self.path != '/evaluate':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            cases = payload['cases'] if isinstance(payload, dict) else payload
+            if not isinstance(cases, list) or not cases:
+                raise ValueError("'cases' must be a non-empty list")
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {'error': f"Invalid request: {e}"})
+            return
+
+        job = self.server.service.submit(cases)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+
+#Writes each event as soon as the worker produces it, and stops quietly if the client has disconnected.
+        try:
+            for event in job.stream():
+                self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
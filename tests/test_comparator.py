@@ -0,0 +1,84 @@
+import random
+import pytest
+from src.comparator import RunComparator, save_scores
+from src.prompt_catalog import case_hash
+
+
+#Scores are stored as float32, so the tests use values that float32 holds exactly.
+def make_results(cases):
+    return [{
+        'case_hash': case_hash(template, params),
+        'template': template,
+        'scores': {'relevance': overall, 'overall': overall}
+    } for template, params, overall in cases]
+
+
+def load(tmp_path, name, results, vectorizer="abc"):
+    path = str(tmp_path / f"{name}.npz")
+    save_scores(results, path, vectorizer)
+    return RunComparator(threshold=0.25).load(path)
+
+
+def test_join_ignores_case_order(tmp_path):
+    cases = [("science_basic", {'concept': f"concept {i}"}, 0.5) for i in range(50)]
+    shuffled = cases[:]
+    random.Random(0).shuffle(shuffled)
+
+    comparator = RunComparator(threshold=0.25)
+    comparison = comparator.compare(load(tmp_path, "base", make_results(cases)),
+                                    load(tmp_path, "current", make_results(shuffled)), include_cases=True)
+
+    assert comparison['summary']['matched_cases'] == 50
+    assert comparison['summary']['changed_cases'] == 0
+    assert comparison['cases'] == []
+    assert comparison['summary']['same_vectorizer']
+
+
+def test_duplicates_are_counted(tmp_path):
+    base = [("science_basic", {'concept': "atoms"}, 0.5)]
+    current = [("science_basic", {'concept': "atoms"}, 0.5), ("science_basic", {'concept': "atoms"}, 0.25)]
+
+    comparison = RunComparator(threshold=0.25).compare(load(tmp_path, "base", make_results(base)),
+                                                       load(tmp_path, "current", make_results(current)))
+
+    assert comparison['summary']['matched_cases'] == 1
+    assert comparison['summary']['duplicates_in_base'] == 0
+    assert comparison['summary']['duplicates_in_current'] == 1
+    assert comparison['metric_deltas']['overall'] == -0.125
+    assert "Duplicate cases averaged" in RunComparator().generate_report(comparison)
+
+
+def test_single_case_template_uses_threshold_alone(tmp_path):
+    base = [("science_basic", {'concept': "atoms"}, 0.75), ("real_world", {'concept': "magnets"}, 0.75)]
+    current = [("science_basic", {'concept': "atoms"}, 0.5), ("real_world", {'concept': "magnets"}, 0.625)]
+
+    comparison = RunComparator(threshold=0.25).compare(load(tmp_path, "base", make_results(base)),
+                                                       load(tmp_path, "current", make_results(current)))
+    templates = {t['template']: t for t in comparison['templates']}
+
+    assert templates['science_basic']['count'] == 1
+    assert templates['science_basic']['regressed']
+    assert not templates['real_world']['regressed']
+
+
+@pytest.mark.parametrize("current, regressed", [(0.5, True), (0.5078125, False)])
+def test_threshold_boundary(tmp_path, current, regressed):
+    base = [("science_basic", {'concept': "atoms"}, 0.75)]
+
+    comparison = RunComparator(threshold=0.25).compare(
+        load(tmp_path, "base", make_results(base)),
+        load(tmp_path, "current", make_results([("science_basic", {'concept': "atoms"}, current)]))
+    )
+
+    assert (comparison['summary']['regressed_cases'] == 1) == regressed
+
+
+def test_different_vectorizers_warn(tmp_path):
+    cases = [("science_basic", {'concept': "atoms"}, 0.5)]
+    comparator = RunComparator()
+
+    comparison = comparator.compare(load(tmp_path, "base", make_results(cases), "abc"),
+                                    load(tmp_path, "current", make_results(cases), "def"))
+
+    assert not comparison['summary']['same_vectorizer']
+    assert "**Warning**" in comparator.generate_report(comparison)
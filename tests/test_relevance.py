@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from src.relevance import RelevanceScorer
+
+
+CONCEPTS = ['photosynthesis', 'fractions', 'magnetism']
+RESPONSES = [
+    'Photosynthesis is how plants turn sunlight into food.',
+    'A fraction is a part of a whole, like half of a pizza.',
+    'Magnets pull on iron because of magnetism.'
+]
+
+
+def test_empty_vocabulary_scores_zero():
+    scorer = RelevanceScorer()
+    scores = scorer.fit_score(['the', 'a'], ['to', 'of the'])
+
+    assert scores.tolist() == [0.0, 0.0]
+    assert scorer.score(['the'], ['a']).tolist() == [0.0]
+
+
+def test_empty_vocabulary_cannot_be_saved(tmp_path):
+    scorer = RelevanceScorer()
+    scorer.fit_score(['the'], ['a'])
+
+    with pytest.raises(ValueError):
+        scorer.save(str(tmp_path / 'vectorizer.joblib'))
+
+
+def test_empty_batch():
+    assert len(RelevanceScorer().fit_score([], [])) == 0
+    assert len(RelevanceScorer.unfitted().score([], [])) == 0
+
+
+def test_fit_score_matches_transform():
+    scorer = RelevanceScorer()
+    fitted = scorer.fit_score(CONCEPTS, RESPONSES)
+
+    assert np.allclose(fitted, scorer.score(CONCEPTS, RESPONSES))
+    assert fitted[2] > 0
+    assert fitted[1] > 0
+    assert ((0 <= fitted) & (fitted <= 1)).all()
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'vectorizer.joblib')
+    scorer = RelevanceScorer()
+    scores = scorer.fit_score(CONCEPTS, RESPONSES)
+    scorer.save(path)
+
+    loaded = RelevanceScorer.load(path)
+
+    assert np.array_equal(loaded.score(CONCEPTS, RESPONSES), scores)
+
+
+def test_lengths_must_match():
+    with pytest.raises(ValueError):
+        RelevanceScorer().fit_score(['a concept'], [])
@@ -0,0 +1,63 @@
+import json
+import threading
+import pytest
+from src.pipeline import Pipeline
+from src.service import EvaluationService
+
+
+@pytest.fixture(scope="module")
+def cases():
+    with open("data/test_cases.json", "r") as f:
+        return json.load(f)
+
+
+def run_concurrently(service, jobs_cases):
+    #Submits every job from its own thread at the same time and collects the results each one streams back.
+    results = [None] * len(jobs_cases)
+
+    def submit(i):
+        job = service.submit(jobs_cases[i])
+        results[i] = [event['result'] for event in job.stream() if event['event'] == 'result']
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(jobs_cases))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    return results
+
+
+def test_concurrent_jobs_match_local_run(cases):
+    pipeline = Pipeline(use_mock=True)
+    jobs_cases = [cases[:7], cases[7:]]
+    expected = [pipeline.run(job_cases) for job_cases in jobs_cases]
+
+    #A long window makes sure both jobs land in the same batch.
+    service = EvaluationService(pipeline, batch_window=1.0)
+
+    assert run_concurrently(service, jobs_cases) == expected
+
+
+def test_concurrent_jobs_match_local_run_with_vectorizer(cases, tmp_path):
+    path = str(tmp_path / "vectorizer.joblib")
+    pipeline = Pipeline(use_mock=True)
+    pipeline.run(cases)
+    pipeline.evaluator.fitted_relevance.save(path)
+
+    pipeline = Pipeline(use_mock=True, relevance_model=path)
+    jobs_cases = [cases[:7], cases[7:]]
+    expected = [pipeline.run(job_cases) for job_cases in jobs_cases]
+
+    service = EvaluationService(pipeline, batch_window=1.0)
+
+    assert run_concurrently(service, jobs_cases) == expected
+
+
+def test_invalid_case_fails_only_its_job(cases):
+    service = EvaluationService(Pipeline(use_mock=True), batch_window=1.0)
+    bad = [{'template': 'no_such_template', 'params': {}}]
+
+    good_results, bad_results = run_concurrently(service, [cases[:3], bad])
+
+    assert len(good_results) == 3
+    assert bad_results == []